@@ -0,0 +1,71 @@
+"""
+Response Cache
+
+Small in-process TTL cache for read-heavy public endpoints.
+Payloads are serialized once per entry and served with an ETag so clients
+holding a fresh copy get a 304 instead of the full body.
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+import orjson
+from fastapi import Request, Response
+
+
+class ResponseCache:
+    """TTL cache of serialized JSON bodies keyed by route + query params"""
+
+    def __init__(self, ttl: float = 60, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.version = 0
+        self._entries: dict = {}
+
+    def invalidate(self):
+        """Drop every entry; loads already in flight land under a stale version"""
+        self.version += 1
+        self._entries.clear()
+
+    def _evict(self, now: float):
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        while len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        """Return (body, etag), sharing a single load between concurrent callers"""
+        key = (self.version, key)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return await asyncio.shield(entry[1])
+
+        async def load():
+            body = orjson.dumps(await loader())
+            etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+            return body, etag
+
+        if len(self._entries) >= self.maxsize:
+            self._evict(now)
+        task = asyncio.ensure_future(load())
+        self._entries[key] = (now + self.ttl, task)
+
+        def evict_failure(done):
+            # never cache failures (e.g. a 404 or a database error), even when
+            # the request that started the load has already gone away
+            if (done.cancelled() or done.exception() is not None) and self._entries.get(key, (None, None))[1] is done:
+                del self._entries[key]
+
+        task.add_done_callback(evict_failure)
+        # shield so one disconnecting client doesn't cancel the shared load
+        return await asyncio.shield(task)
+
+    async def respond(self, request: Request, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Response:
+        """Serve a cached JSON body, or a 304 when the client's ETag matches"""
+        body, etag = await self.get_or_load(key, loader)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(body, media_type="application/json", headers={"ETag": etag})
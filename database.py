@@ -5,7 +5,11 @@ MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
 """
 
-from pymongo import MongoClient
+import asyncio
+import logging
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
@@ -15,21 +19,46 @@ from pydantic import BaseModel
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 _client = None
 db = None
 
 database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
-if database_url and database_name:
-    _client = MongoClient(database_url)
-    db = _client[database_name]
+
+class DatabaseUnavailable(Exception):
+    """Raised by the helpers when no database is configured (served as a 503)"""
+
+
+def connect():
+    """Create the shared client and connection pool (call once at startup)"""
+    global _client, db
+    if _client is None and database_url and database_name:
+        _client = AsyncIOMotorClient(database_url, maxPoolSize=100, minPoolSize=10)
+        db = _client[database_name]
+    return db
+
+
+def close():
+    """Close the shared client and its pooled connections (call at shutdown)"""
+    global _client, db
+    if _client is not None:
+        _client.close()
+    _client = None
+    db = None
+
 
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+def utc_now() -> datetime:
+    """Timezone-aware current UTC time (replaces deprecated datetime.utcnow)"""
+    return datetime.now(timezone.utc)
+
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
-        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+        raise DatabaseUnavailable("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
 
     # Convert Pydantic model to dict if needed
     if isinstance(data, BaseModel):
@@ -37,19 +66,95 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     else:
         data_dict = data.copy()
 
-    data_dict['created_at'] = datetime.now(timezone.utc)
-    data_dict['updated_at'] = datetime.now(timezone.utc)
+    data_dict['created_at'] = data_dict['updated_at'] = utc_now()
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await db[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
-    """Get documents from collection"""
+async def get_documents(collection_name: str, filter_dict: dict = None, sort: list = None, limit: int = None, projection: dict = None):
+    """Get documents from collection, optionally sorted and projected server-side"""
     if db is None:
-        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+        raise DatabaseUnavailable("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = db[collection_name].find(filter_dict or {}, projection)
+    if sort:
+        cursor = cursor.sort(sort)
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    docs = await cursor.to_list(limit)
+    for doc in docs:
+        stringify_id(doc)
+    return docs
+
+def find_documents(collection_name: str, filter_dict: dict = None, sort: list = None, projection: dict = None):
+    """Open a cursor for callers that stream results; pass docs through stringify_id"""
+    if db is None:
+        raise DatabaseUnavailable("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    cursor = db[collection_name].find(filter_dict or {}, projection)
+    if sort:
+        cursor = cursor.sort(sort)
+    return cursor
+
+def stringify_id(doc: dict) -> dict:
+    """ObjectId is not JSON serializable; expose it as a plain string"""
+    if "_id" in doc:
+        doc["_id"] = str(doc["_id"])
+    return doc
+
+async def ensure_indexes():
+    """Create the indexes backing the API's queries (no-op if they exist)"""
+    if db is None:
+        return
+    await asyncio.gather(
+        # menu filters and admin upserts
+        _create_index("menucategory", [("slug", 1)], unique=True),
+        _create_index("menuitem", [("slug", 1)]),
+        _create_index("menuitem", [("category_slug", 1)]),
+        _create_index("menuitem", [("tags", 1)]),  # multikey
+        # blog list (filter + sort) and detail
+        _create_index("blogpost", [("published", 1), ("published_at", -1)]),
+        _create_index("blogpost", [("slug", 1)], unique=True),
+        # gallery list (filter + sort)
+        _create_index("galleryimage", [("is_active", 1), ("position", 1)]),
+        # uniqueness / atomic upserts
+        _create_index("subscriber", "email", unique=True),
+        _create_index("reservation_slot", [("date", 1), ("time", 1)], unique=True),
+        _create_index("order", "order_uuid", unique=True, sparse=True),
+        # webhook payment confirmation
+        _create_index("order", "payment_intent_id"),
+    )
+
+async def _create_index(collection_name: str, keys, **kwargs):
+    try:
+        await db[collection_name].create_index(keys, **kwargs)
+    except OperationFailure as e:
+        # e.g. existing duplicate rows block a unique index; keep serving without it
+        logger.error("Could not create index %s on %s: %s", keys, collection_name, e)
+
+async def seed_reservation_slots():
+    """Initialise reservation_slot counters from bookings made before the counters existed"""
+    if db is None:
+        return
+    pipeline = [
+        {"$match": {"status": {"$in": ["requested", "confirmed"]}}},
+        {"$group": {"_id": {"date": "$date", "time": "$time"}, "count": {"$sum": 1}}},
+    ]
+    ops = [
+        # $setOnInsert leaves counters that are already being tracked untouched
+        UpdateOne(
+            {"date": g["_id"]["date"], "time": g["_id"]["time"]},
+            {"$setOnInsert": {"count": g["count"]}},
+            upsert=True,
+        )
+        async for g in db["reservation"].aggregate(pipeline)
+    ]
+    if not ops:
+        return
+    try:
+        await db["reservation_slot"].bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        # another worker seeding the same slot concurrently is fine
+        if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+            raise
@@ -1,12 +1,24 @@
+import asyncio
 import os
-from datetime import datetime
-from typing import Optional, List
+from contextlib import asynccontextmanager
+from typing import Optional, List, Literal
 
-from fastapi import FastAPI, HTTPException, Depends, Response, Cookie
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, Cookie
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-
-from database import db, create_document, get_documents
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from pydantic import BaseModel, Field
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from cache import ResponseCache
+import database
+from database import create_document, get_documents, find_documents, stringify_id, ensure_indexes, seed_reservation_slots, utc_now
 from schemas import (
     User,
     MenuCategory,
@@ -25,69 +37,113 @@ import hashlib
 import hmac
 import secrets
 
-app = FastAPI(title="BoomiisUK API")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # open the pool before serving traffic so first requests don't pay the handshake
+    app.state.db = database.connect()
+    if app.state.db is not None:
+        await app.state.db.command("ping")
+        await ensure_indexes()
+        await seed_reservation_slots()
+    yield
+    database.close()
+
+
+app = FastAPI(title="BoomiisUK API", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# comma-separated list of frontend origins allowed to call the API with cookies
+CORS_ORIGINS = [
+    o.strip()
+    for o in os.getenv("CORS_ORIGINS", "https://boomiis.uk,https://admin.boomiis.uk").split(",")
+    if o.strip()
+]
+
+app.add_middleware(GZipMiddleware, minimum_size=512)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
+
+@app.exception_handler(database.DatabaseUnavailable)
+async def database_unavailable(request: Request, exc: database.DatabaseUnavailable):
+    return ORJSONResponse(status_code=503, content={"detail": "Database not available"})
+
+
+async def get_db(request: Request):
+    db = request.app.state.db
+    if db is None:
+        raise database.DatabaseUnavailable()
+    return db
+
+
 # -----------------
 # Auth (very simple session cookie)
 # -----------------
 SESSION_COOKIE = "boom_admin"
 SESSION_SECRET = os.getenv("ADMIN_SESSION_SECRET", "dev-secret-change")
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", "admin@boomiis.uk")
-ADMIN_PASSWORD_HASH = os.getenv("ADMIN_PASSWORD_HASH")  # store sha256 hash
-
-class LoginRequest(BaseModel):
-    email: str
-    password: str
+_password_hasher = PasswordHasher()
 
 
 def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+    return _password_hasher.hash(password)
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    return hmac.compare_digest(hash_password(password), hashed)
+    try:
+        return _password_hasher.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
 
+# store an argon2 encoded hash; without one, bootstrap once from ENV ADMIN_PASSWORD
+ADMIN_PASSWORD_HASH = os.getenv("ADMIN_PASSWORD_HASH") or hash_password(os.getenv("ADMIN_PASSWORD", "admin12345"))
 
-def require_admin(session: Optional[str] = Cookie(default=None, alias=SESSION_COOKIE)):
+# Only the admin email can hold a session, so its signature is computed once
+_SESSION_SECRET_B = SESSION_SECRET.encode()
+_ADMIN_EMAIL_B = ADMIN_EMAIL.encode()
+_ADMIN_SIG = hmac.new(_SESSION_SECRET_B, msg=_ADMIN_EMAIL_B, digestmod=hashlib.sha256).digest()
+_ADMIN_COOKIE = f"{ADMIN_EMAIL}:{_ADMIN_SIG.hex()}"
+
+class LoginRequest(BaseModel):
+    email: str
+    password: str
+
+
+async def require_admin(session: Optional[str] = Cookie(default=None, alias=SESSION_COOKIE)):
     if not session:
         raise HTTPException(status_code=401, detail="Not authenticated")
     # Simple HMAC verification
     try:
-        email, sig = session.split(":", 1)
-        expected = hmac.new(SESSION_SECRET.encode(), msg=email.encode(), digestmod=hashlib.sha256).hexdigest()
-        if not hmac.compare_digest(sig, expected):
+        email_b, sig_hex = session.encode().split(b":", 1)
+        sig = bytes.fromhex(sig_hex.decode())
+        if not hmac.compare_digest(sig, _ADMIN_SIG):
             raise ValueError("bad sig")
-        if email != ADMIN_EMAIL:
+        if email_b != _ADMIN_EMAIL_B:
             raise ValueError("not admin")
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid session")
 
 
 @app.post("/api/admin/login")
-def admin_login(payload: LoginRequest, resp: Response):
-    if not ADMIN_PASSWORD_HASH:
-        # allow first-time bootstrap with ENV ADMIN_PASSWORD
-        admin_plain = os.getenv("ADMIN_PASSWORD", "admin12345")
-        os.environ["ADMIN_PASSWORD_HASH"] = hash_password(admin_plain)
-    hashed = os.getenv("ADMIN_PASSWORD_HASH")
-    if payload.email != ADMIN_EMAIL or not verify_password(payload.password, hashed):
+async def admin_login(payload: LoginRequest, resp: Response):
+    # argon2 is deliberately slow; keep it off the event loop. It runs for every
+    # attempt so response time doesn't reveal whether the email matched.
+    ok = await run_in_threadpool(verify_password, payload.password, ADMIN_PASSWORD_HASH)
+    if not (ok and payload.email == ADMIN_EMAIL):
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    sig = hmac.new(SESSION_SECRET.encode(), msg=ADMIN_EMAIL.encode(), digestmod=hashlib.sha256).hexdigest()
-    cookie_val = f"{ADMIN_EMAIL}:{sig}"
-    resp.set_cookie(SESSION_COOKIE, cookie_val, httponly=True, secure=False, samesite="lax", max_age=60*60*8)
+    resp.set_cookie(SESSION_COOKIE, _ADMIN_COOKIE, httponly=True, secure=False, samesite="lax", max_age=60*60*8)
     return {"ok": True}
 
 
 @app.post("/api/admin/logout")
-def admin_logout(resp: Response):
+async def admin_logout(resp: Response):
     resp.delete_cookie(SESSION_COOKIE)
     return {"ok": True}
 
@@ -96,7 +152,7 @@ def admin_logout(resp: Response):
 # Utility
 # -----------------
 @app.get("/test")
-def test_database():
+async def test_database(request: Request):
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -106,10 +162,11 @@ def test_database():
         "collections": []
     }
     try:
+        db = request.app.state.db
         if db is not None:
             response["database"] = "✅ Available"
             response["database_name"] = getattr(db, 'name', 'unknown')
-            collections = db.list_collection_names()
+            collections = await db.list_collection_names()
             response["collections"] = collections[:20]
             response["database"] = "✅ Connected & Working"
             response["connection_status"] = "Connected"
@@ -124,38 +181,92 @@ def test_database():
 # -----------------
 # Public Content Endpoints
 # -----------------
+# Public menu list view: only the fields the menu page renders
+MENU_ITEM_LIST_FIELDS = {
+    "title": 1, "slug": 1, "price": 1, "currency": 1, "image_url": 1,
+    "category_slug": 1, "tags": 1, "allergens": 1, "_id": 0,
+}
+
+
+async def load_menu(item_filter: dict = None, item_projection: dict = None):
+    """Fetch categories and items concurrently (two reads in parallel)"""
+    cats, items = await asyncio.gather(
+        get_documents("menucategory"),
+        get_documents("menuitem", item_filter, projection=item_projection),
+    )
+    return {"categories": cats, "items": items}
+
+
+# items in the first read, fetched alongside the categories before streaming starts
+MENU_STREAM_FIRST_BATCH = 100
+
+
+async def stream_menu(item_filter: dict = None) -> StreamingResponse:
+    """Stream the menu, encoding items straight off the cursor instead of buffering them"""
+    items = find_documents("menuitem", item_filter)
+    # Categories are few, so buffer them. Start both reads together, and before
+    # the 200 headers are sent, so a database error becomes a proper error response.
+    cats, first_items = await asyncio.gather(
+        get_documents("menucategory"),
+        items.to_list(MENU_STREAM_FIRST_BATCH),
+    )
+
+    async def body():
+        yield b'{"categories":' + orjson.dumps(cats) + b',"items":['
+        sep = b""
+        for doc in first_items:
+            yield sep + orjson.dumps(stringify_id(doc))
+            sep = b","
+        async for doc in items:
+            yield sep + orjson.dumps(stringify_id(doc))
+            sep = b","
+        yield b"]}"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+# Public reads change rarely; admin menu writes invalidate the cache
+public_cache = ResponseCache(ttl=60)
+
+
 @app.get("/api/menu")
-def get_menu(tag: Optional[str] = None, category: Optional[str] = None):
+async def get_menu(request: Request, tag: Optional[str] = None, category: Optional[str] = None):
     q = {}
     if tag:
         q["tags"] = {"$in": [tag]}
     if category:
         q["category_slug"] = category
-    items = get_documents("menuitem", q)
-    cats = get_documents("menucategory")
-    return {"categories": cats, "items": items}
+
+    return await public_cache.respond(request, ("menu", tag, category), lambda: load_menu(q, MENU_ITEM_LIST_FIELDS))
 
 
 @app.get("/api/blog")
-def blog_list():
-    posts = get_documents("blogpost", {"published": True})
-    posts.sort(key=lambda p: p.get("published_at") or datetime.utcnow(), reverse=True)
-    return posts
+async def blog_list(request: Request):
+    async def load():
+        return await get_documents(
+            "blogpost", {"published": True}, sort=[("published_at", -1)], projection={"content": 0}
+        )
+
+    return await public_cache.respond(request, ("blog",), load)
 
 
 @app.get("/api/blog/{slug}")
-def blog_detail(slug: str):
-    docs = get_documents("blogpost", {"slug": slug, "published": True}, limit=1)
-    if not docs:
-        raise HTTPException(status_code=404, detail="Not found")
-    return docs[0]
+async def blog_detail(request: Request, slug: str):
+    async def load():
+        docs = await get_documents("blogpost", {"slug": slug, "published": True}, limit=1)
+        if not docs:
+            raise HTTPException(status_code=404, detail="Not found")
+        return docs[0]
+
+    return await public_cache.respond(request, ("blog", slug), load)
 
 
 @app.get("/api/gallery")
-def gallery_list():
-    images = get_documents("galleryimage", {"is_active": True})
-    images.sort(key=lambda x: x.get("position", 0))
-    return images
+async def gallery_list(request: Request):
+    async def load():
+        return await get_documents("galleryimage", {"is_active": True}, sort=[("position", 1)])
+
+    return await public_cache.respond(request, ("gallery",), load)
 
 
 class SubscribeBody(BaseModel):
@@ -164,120 +275,201 @@ class SubscribeBody(BaseModel):
 
 
 @app.post("/api/subscribe")
-def subscribe(body: SubscribeBody):
-    # naive uniqueness by email
-    existing = get_documents("subscriber", {"email": body.email}, limit=1)
-    if existing:
-        return {"ok": True}
-    create_document("subscriber", body.model_dump())
+async def subscribe(body: SubscribeBody, db=Depends(get_db)):
+    # uniqueness is enforced by the unique index on subscriber.email
+    now = utc_now()
+    try:
+        await db["subscriber"].update_one(
+            {"email": body.email},
+            {"$setOnInsert": {**body.model_dump(), "created_at": now, "updated_at": now}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # concurrent upsert for the same email already inserted it
+        pass
     return {"ok": True}
 
 
 # -----------------
 # Orders + Stripe
 # -----------------
+try:
+    import stripe  # type: ignore
+except ImportError:  # Stripe is optional; checkout works without payment intents
+    stripe = None
+
+STRIPE_SECRET = os.getenv("STRIPE_SECRET")
+STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
+if stripe is not None and STRIPE_SECRET:
+    # configure once; the client is reused across requests
+    stripe.api_key = STRIPE_SECRET
+
+
 class CreateOrderBody(BaseModel):
     full_name: Optional[str] = None
     email: Optional[str] = None
     phone: Optional[str] = None
-    order_type: str
+    order_type: Literal["pickup", "delivery"]
     address: Optional[str] = None
     scheduled_for: Optional[str] = None
     items: List[OrderItem]
     notes: Optional[str] = None
+    # lets a checkout retry reuse the same PaymentIntent and order
+    order_uuid: Optional[str] = Field(None, min_length=16, max_length=64)
 
 
 def calculate_totals(items: List[OrderItem]):
-    subtotal = sum(i.unit_price * i.quantity for i in items)
-    taxes = round(subtotal * 0.0, 2)  # adjust if VAT to be shown separately
-    fees = 0.0
-    total = round(subtotal + taxes + fees, 2)
+    """Return (subtotal, taxes, fees, total) in integer pence"""
+    subtotal = sum(i.subtotal_pence for i in items)
+    taxes = 0  # adjust if VAT to be shown separately
+    fees = 0
+    total = subtotal + taxes + fees
     return subtotal, taxes, fees, total
 
 
 @app.post("/api/orders")
-def create_order(body: CreateOrderBody):
+async def create_order(body: CreateOrderBody, db=Depends(get_db)):
     subtotal, taxes, fees, total = calculate_totals(body.items)
-    order_doc = Order(
+    order_uuid = body.order_uuid or secrets.token_urlsafe(16)
+    # body is already validated, so assemble the stored order without re-validating
+    order_doc = Order.model_construct(
+        order_uuid=order_uuid,
         full_name=body.full_name,
         email=body.email,
         phone=body.phone,
-        order_type=body.order_type,  # pickup|delivery
+        order_type=body.order_type,
         address=body.address,
         scheduled_for=None,
         items=body.items,
         notes=body.notes,
-        subtotal=subtotal,
-        taxes=taxes,
-        fees=fees,
-        total=total,
+        subtotal=subtotal / 100,
+        taxes=taxes / 100,
+        fees=fees / 100,
+        total=total / 100,
         currency="GBP",
     ).model_dump()
 
-    stripe_secret = os.getenv("STRIPE_SECRET")
-    if stripe_secret:
+    if STRIPE_SECRET:
+        if stripe is None:
+            raise HTTPException(status_code=500, detail="Stripe error: stripe package not installed")
         try:
-            import stripe  # type: ignore
-            stripe.api_key = stripe_secret
-            intent = stripe.PaymentIntent.create(
-                amount=int(total * 100),
+            intent = await stripe.PaymentIntent.create_async(
+                amount=total,
                 currency="gbp",
                 automatic_payment_methods={"enabled": True},
-                metadata={"site": "BoomiisUK"},
+                metadata={"site": "BoomiisUK", "order_uuid": order_uuid},
+                idempotency_key=order_uuid,
             )
             order_doc["payment_intent_id"] = intent["id"]
             order_doc["status"] = "payment_required"
+        except stripe.IdempotencyError:
+            # same order_uuid retried with a different cart/amount
+            raise HTTPException(status_code=409, detail="order_uuid already used for a different order")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Stripe error: {str(e)[:120]}")
 
-    order_id = create_document("order", order_doc)
-    return {"order_id": order_id, "client_secret": order_doc.get("payment_intent_id")}
+    # single write keyed by order_uuid; a retried checkout leaves the first order in place
+    now = utc_now()
+    result = await db["order"].update_one(
+        {"order_uuid": order_uuid},
+        {"$setOnInsert": {**order_doc, "created_at": now, "updated_at": now}},
+        upsert=True,
+    )
+    if result.upserted_id is not None:
+        order_id = str(result.upserted_id)
+    else:
+        existing = await db["order"].find_one({"order_uuid": order_uuid}, {"_id": 1})
+        order_id = str(existing["_id"])
+    return {"order_id": order_id, "order_uuid": order_uuid, "client_secret": order_doc.get("payment_intent_id")}
 
 
 class ConfirmBody(BaseModel):
     order_id: str
-    payment_ref: Optional[str] = None
 
 
 @app.post("/api/orders/confirm")
-def confirm_order(body: ConfirmBody):
-    # Minimal confirmation stub (would normally verify PaymentIntent status via Stripe webhook or fetch)
-    # For MVP: mark as paid when a payment_ref provided
-    from bson import ObjectId
+async def confirm_order(body: ConfirmBody, db=Depends(get_db)):
+    # Payment is recorded by the Stripe webhook; this only reports the order's status
     if not body.order_id:
         raise HTTPException(status_code=400, detail="Missing order_id")
-    try:
-        oid = ObjectId(body.order_id)
-    except Exception:
+    if not ObjectId.is_valid(body.order_id):
         raise HTTPException(status_code=400, detail="Invalid id")
+    order = await db["order"].find_one({"_id": ObjectId(body.order_id)}, {"status": 1})
+    if order is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return {"ok": True, "status": order.get("status")}
+
+
+async def _mark_paid(db, payment_intent_id: str):
+    await db["order"].update_one(
+        {"payment_intent_id": payment_intent_id},
+        {"$set": {"status": "paid", "payment_ref": payment_intent_id, "updated_at": utc_now()}},
+    )
+
+
+@app.post("/api/stripe/webhook")
+async def stripe_webhook(request: Request, db=Depends(get_db)):
+    if stripe is None or not STRIPE_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="Stripe webhooks not configured")
+    payload = await request.body()
+    sig = request.headers.get("stripe-signature")
+    if not sig:
+        raise HTTPException(status_code=400, detail="Missing signature")
     try:
-        db["order"].update_one({"_id": oid}, {"$set": {"status": "paid", "payment_ref": body.payment_ref, "updated_at": datetime.utcnow()}})
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    return {"ok": True}
+        event = stripe.Webhook.construct_event(payload, sig, STRIPE_WEBHOOK_SECRET)
+    except (ValueError, stripe.SignatureVerificationError):
+        raise HTTPException(status_code=400, detail="Invalid payload")
+    # a single indexed update, done before acknowledging so that a failed write
+    # returns 5xx and Stripe redelivers the event
+    if event["type"] == "payment_intent.succeeded":
+        await _mark_paid(db, event["data"]["object"]["id"])
+    return Response(status_code=200)
 
 
 # -----------------
 # Reservations
 # -----------------
+SLOT_CAPACITY = 20
+
+
+async def claim_reservation_slot(db, date: str, time: str) -> bool:
+    """Atomically take one place in a slot; False when the slot is full"""
+    query = {"date": date, "time": time, "count": {"$lt": SLOT_CAPACITY}}
+    update = {"$inc": {"count": 1}}
+    try:
+        slot = await db["reservation_slot"].find_one_and_update(
+            query, update, upsert=True, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Either the slot is full (upsert collided with the existing counter)
+        # or a concurrent request created it first; retry without upsert.
+        slot = await db["reservation_slot"].find_one_and_update(
+            query, update, return_document=ReturnDocument.AFTER
+        )
+    return slot is not None
+
+
 class ReservationBody(BaseModel):
     full_name: str
     email: str
     phone: str
     date: str
     time: str
-    party_size: int
+    party_size: int = Field(..., ge=1, le=20)
     notes: Optional[str] = None
 
 
 @app.post("/api/reservations")
-def create_reservation(body: ReservationBody):
-    # Basic availability placeholder: limit to 20 seats per 30 minutes slot
-    slot_key = f"{body.date} {body.time}"
-    existing = db["reservation"].count_documents({"date": body.date, "time": body.time, "status": {"$in": ["requested", "confirmed"]}})
-    if existing >= 20:
+async def create_reservation(body: ReservationBody, db=Depends(get_db)):
+    # Basic availability placeholder: limit to 20 bookings per 30 minutes slot
+    if not await claim_reservation_slot(db, body.date, body.time):
         raise HTTPException(status_code=409, detail="Fully booked for this time slot")
-    res_id = create_document("reservation", Reservation(**body.model_dump()).model_dump())
+    try:
+        res_id = await create_document("reservation", body.model_dump() | {"status": "requested"})
+    except Exception:
+        # give the place back so a failed insert doesn't leak capacity
+        await db["reservation_slot"].update_one({"date": body.date, "time": body.time}, {"$inc": {"count": -1}})
+        raise
     return {"reservation_id": res_id}
 
 
@@ -295,8 +487,8 @@ class EventInquiryBody(BaseModel):
 
 
 @app.post("/api/events/inquiry")
-def new_inquiry(body: EventInquiryBody):
-    inq_id = create_document("eventinquiry", EventInquiry(**body.model_dump()).model_dump())
+async def new_inquiry(body: EventInquiryBody):
+    inq_id = await create_document("eventinquiry", body.model_dump() | {"status": "new"})
     return {"inquiry_id": inq_id}
 
 
@@ -304,11 +496,9 @@ def new_inquiry(body: EventInquiryBody):
 # Admin CRUD (minimal)
 # -----------------
 @app.get("/api/admin/menu", dependencies=[Depends(require_admin)])
-def admin_menu():
-    return {
-        "categories": get_documents("menucategory"),
-        "items": get_documents("menuitem"),
-    }
+async def admin_menu():
+    # uncached and always the full collections, so stream rather than buffer
+    return await stream_menu()
 
 
 class UpsertCategory(BaseModel):
@@ -320,8 +510,9 @@ class UpsertCategory(BaseModel):
 
 
 @app.post("/api/admin/menu/category", dependencies=[Depends(require_admin)])
-def upsert_category(cat: UpsertCategory):
-    db["menucategory"].update_one({"slug": cat.slug}, {"$set": cat.model_dump()}, upsert=True)
+async def upsert_category(cat: UpsertCategory, db=Depends(get_db)):
+    await db["menucategory"].update_one({"slug": cat.slug}, {"$set": cat.model_dump()}, upsert=True)
+    public_cache.invalidate()
     return {"ok": True}
 
 
@@ -339,8 +530,9 @@ class UpsertItem(BaseModel):
 
 
 @app.post("/api/admin/menu/item", dependencies=[Depends(require_admin)])
-def upsert_item(item: UpsertItem):
-    db["menuitem"].update_one({"slug": item.slug}, {"$set": item.model_dump()}, upsert=True)
+async def upsert_item(item: UpsertItem, db=Depends(get_db)):
+    await db["menuitem"].update_one({"slug": item.slug}, {"$set": item.model_dump()}, upsert=True)
+    public_cache.invalidate()
     return {"ok": True}
 
 
@@ -348,15 +540,24 @@ def upsert_item(item: UpsertItem):
 # Schema endpoint for viewer tooling
 # -----------------
 @app.get("/schema")
-def get_schema_definitions():
-    return {
-        "collections": [
-            "user","menucategory","menuitem","order","orderitem","reservation","eventinquiry","blogpost","galleryimage","subscriber","sitesetting"
-        ]
-    }
+async def get_schema_definitions(request: Request):
+    async def load():
+        return {
+            "collections": [
+                "user","menucategory","menuitem","order","orderitem","reservation","eventinquiry","blogpost","galleryimage","subscriber","sitesetting"
+            ]
+        }
+
+    return await public_cache.respond(request, ("schema",), load)
 
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        # loop/http default to "auto", which picks uvloop and httptools when installed
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
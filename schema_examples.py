@@ -5,7 +5,7 @@ This file contains example schemas and patterns for typical applications.
 Copy and modify these examples for your specific needs.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from database import create_document, get_documents, update_document, delete_document
 
 # =============================================================================
@@ -63,7 +63,7 @@ def add_comment_to_post(post_id: str, author_id: str, comment_text: str):
         "id": str(ObjectId()),
         "author_id": author_id,
         "text": comment_text,
-        "created_at": datetime.utcnow(),
+        "created_at": datetime.now(timezone.utc),
         "likes": 0
     }
     
@@ -184,7 +184,7 @@ def create_chat_room(name: str, type: str = "group", members: list = None):
             "allow_file_sharing": True,
             "message_retention_days": 30
         },
-        "last_activity": datetime.utcnow()
+        "last_activity": datetime.now(timezone.utc)
     }
     return create_document("chat_rooms", room_data)
 
@@ -262,7 +262,7 @@ def track_user_activity(user_id: str, action: str, resource_type: str, resource_
         "ip_address": None,
         "user_agent": None,
         "session_id": None,
-        "timestamp": datetime.utcnow()
+        "timestamp": datetime.now(timezone.utc)
     }
     return create_document("user_activities", activity_data)
 
@@ -282,7 +282,7 @@ def track_page_view(page_path: str, user_id: str = None, session_id: str = None)
             "os": None,
             "browser": None
         },
-        "timestamp": datetime.utcnow()
+        "timestamp": datetime.now(timezone.utc)
     }
     return create_document("page_views", pageview_data)
 
@@ -18,7 +18,7 @@ Collections:
 - sitesetting
 """
 from typing import List, Optional, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field, model_validator
 from datetime import datetime
 
 # Auth/User
@@ -53,11 +53,41 @@ class MenuItem(BaseModel):
 class OrderItem(BaseModel):
     item_slug: str
     title: str
-    unit_price: float
+    unit_price_pence: int = Field(..., ge=0)
     quantity: int = Field(..., ge=1)
-    subtotal: float
+
+    @model_validator(mode="before")
+    @classmethod
+    def _pence_from_unit_price(cls, data):
+        # accept legacy clients that still send a float unit_price
+        if isinstance(data, dict) and "unit_price_pence" not in data and "unit_price" in data:
+            try:
+                pence = round(float(data["unit_price"]) * 100)
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError("unit_price must be a finite number")
+            data = {**data, "unit_price_pence": pence}
+        return data
+
+    @computed_field
+    @property
+    def unit_price(self) -> float:
+        """Display price in pounds"""
+        return self.unit_price_pence / 100
+
+    # derived server-side so a client-sent subtotal can't disagree with the charge
+    @computed_field
+    @property
+    def subtotal_pence(self) -> int:
+        return self.unit_price_pence * self.quantity
+
+    @computed_field
+    @property
+    def subtotal(self) -> float:
+        """Display line total in pounds"""
+        return self.subtotal_pence / 100
 
 class Order(BaseModel):
+    order_uuid: Optional[str] = None  # idempotency key shared with the Stripe PaymentIntent
     full_name: Optional[str] = None
     email: Optional[str] = None
     phone: Optional[str] = None